@@ -40,6 +40,8 @@
 import logging
 import os
 import copy
+import time
+from functools import lru_cache
 
 import gevent
 import gevent.core
@@ -64,6 +66,22 @@ from volttron.platform.vip.agent import Agent, Core, RPC
 
 _log = logging.getLogger(__name__)
 
+# A small set of peers makes most requests, so remember the parsed user ids
+_load_user = lru_cache(maxsize=1024)(load_user)
+
+# Seconds a fetched peerlist is reused by _send_update. The cache is also
+# dropped whenever a peer is added or dropped.
+_PEERLIST_CACHE_TTL = 10.0
+
+# Platform identities whose auth entries are never modified through RPC
+_SKIP_IDENTITIES = frozenset(PROCESS_IDENTITIES) | {CONTROL_CONNECTION}
+
+# Seconds a user's capabilities, groups and roles are reused by
+# get_capabilities, get_groups and get_roles
+_AUTHZ_TTL = 60.0
+# Upper bound on users remembered by get_all_authorizations
+_AUTHZ_CACHE_SIZE = 2048
+
 
 class AuthService(Agent):
     def __init__(
@@ -93,6 +111,11 @@ class AuthService(Agent):
         self.zap_socket = None
         self._zap_greenlet = None
         self.auth_entries = []
+        self._entries_by_identity = {}
+        self._user_to_caps_cache = None
+        self._authz_cache = {}
+        self._peerlist_cache = None
+        self._peerlist_cache_time = 0
         self._is_connected = False
         self._protected_topics_file = protected_topics_file
         self._protected_topics_file_path = os.path.abspath(
@@ -101,9 +124,11 @@ class AuthService(Agent):
         self._protected_topics = {}
         self._protected_topics_for_rmq = ProtectedPubSubTopics()
         self._setup_mode = setup_mode
-        self._auth_pending = []
-        self._auth_denied = []
-        self._auth_approved = []
+        self._auth_pending = {}
+        self._auth_pending_by_key = {}
+        self._auth_denied = {}
+        self._auth_denied_by_key = {}
+        self._auth_approved = {}
         self.authentication_server = None
         self.authorization_server = None
 
@@ -176,6 +201,8 @@ class AuthService(Agent):
             self.authentication_server = RMQServerAuthentication(auth_service=self)
             self.authorization_server = RMQAuthorization(auth_service=self)
         self._read_protected_topics_file()
+        self.vip.peerlist.onadd.connect(self._invalidate_peerlist_cache)
+        self.vip.peerlist.ondrop.connect(self._invalidate_peerlist_cache)
         self.core.spawn(watch_file, self.auth_file_path, self.read_auth_file)
         self.core.spawn(
             watch_file,
@@ -207,45 +234,39 @@ class AuthService(Agent):
             {rpc_method_name: [allowed_rpc_capability_1, ...]}
         :return: updated_rpc_methods or None
         """
-        entries = self.auth_file.read_allow_entries()
-        for entry in entries:
-            if entry.identity == identity:
-                updated_rpc_methods = {}
-                # Only update auth_file if changed
-                is_updated = False
-                for method in rpc_methods:
-                    updated_rpc_methods[method] = rpc_methods[method]
-                    # Check if the rpc method exists in the auth file entry
-                    if method not in entry.rpc_method_authorizations:
-                        # Create it and set it to have the provided
-                        # rpc capabilities
-                        entry.rpc_method_authorizations[method] = rpc_methods[
-                            method
-                        ]
-                        is_updated = True
-                    # Check if the rpc method does not have any
-                    # rpc capabilities
-                    if not entry.rpc_method_authorizations[method]:
-                        # Set it to have the provided rpc capabilities
-                        entry.rpc_method_authorizations[method] = rpc_methods[
-                            method
-                        ]
-                        is_updated = True
-                    # Check if the rpc method's capabilities match
-                    # what have been provided
-                    if (
-                            entry.rpc_method_authorizations[method]
-                            != rpc_methods[method]
-                    ):
-                        # Update rpc_methods based on auth entries
-                        updated_rpc_methods[
-                            method
-                        ] = entry.rpc_method_authorizations[method]
-                # Update auth file if changed and return rpc_methods
-                if is_updated:
-                    self.auth_file.update_by_index(entry, entries.index(entry))
-                return updated_rpc_methods
-        return None
+        hit = self._entries_by_identity.get(identity)
+        if hit is None:
+            return None
+        index, entry = hit
+        entry = copy.deepcopy(entry)
+        updated_rpc_methods = {}
+        # Only update auth_file if changed
+        is_updated = False
+        for method in rpc_methods:
+            updated_rpc_methods[method] = rpc_methods[method]
+            # Check if the rpc method exists in the auth file entry
+            if method not in entry.rpc_method_authorizations:
+                # Create it and set it to have the provided
+                # rpc capabilities
+                entry.rpc_method_authorizations[method] = rpc_methods[method]
+                is_updated = True
+            # Check if the rpc method does not have any
+            # rpc capabilities
+            if not entry.rpc_method_authorizations[method]:
+                # Set it to have the provided rpc capabilities
+                entry.rpc_method_authorizations[method] = rpc_methods[method]
+                is_updated = True
+            # Check if the rpc method's capabilities match
+            # what have been provided
+            if entry.rpc_method_authorizations[method] != rpc_methods[method]:
+                # Update rpc_methods based on auth entries
+                updated_rpc_methods[
+                    method
+                ] = entry.rpc_method_authorizations[method]
+        # Update auth file if changed and return rpc_methods
+        if is_updated:
+            self.auth_file.update_by_index(entry, index)
+        return updated_rpc_methods
 
     def get_entry_authorizations(self, identity):
         """
@@ -258,7 +279,7 @@ class AuthService(Agent):
             rpc_method_authorizations = self.vip.rpc.call(
                 identity, "auth.get_all_rpc_authorizations"
             ).get()
-            _log.debug(f"RPC Methods are: {rpc_method_authorizations}")
+            _log.debug("RPC Methods are: %s", rpc_method_authorizations)
         except Unreachable:
             _log.warning(
                 f"{identity} "
@@ -274,66 +295,79 @@ class AuthService(Agent):
         :param entries: Entries read in from the auth file
         :return: None
         """
+        jobs = []
         for entry in entries:
             # Skip if core agent
             if (
                     entry.identity is not None
-                    and entry.identity not in PROCESS_IDENTITIES
-                    and entry.identity != CONTROL_CONNECTION
+                    and entry.identity not in _SKIP_IDENTITIES
             ):
-                # Collect all modified methods
-                modified_methods = {}
-                for method in entry.rpc_method_authorizations:
-                    # Check if the rpc method does not have
-                    # any rpc capabilities
-                    if not entry.rpc_method_authorizations[method]:
-                        # Do not need to update agent capabilities
-                        # if no capabilities in auth file
-                        continue
-                    modified_methods[method] = entry.rpc_method_authorizations[
-                        method
-                    ]
-                if modified_methods:
-                    method_error = True
+                # Agents are updated concurrently so one slow agent does not
+                # hold up the rest
+                jobs.append(
+                    gevent.spawn(self._update_entry_rpc_authorizations, entry)
+                )
+        gevent.joinall(jobs)
+
+    def _update_entry_rpc_authorizations(self, entry):
+        """
+        Push an auth entry's rpc_method_authorizations to its agent.
+        :param entry: Entry read in from the auth file
+        :return: None
+        """
+        # Collect all modified methods
+        modified_methods = {}
+        for method in entry.rpc_method_authorizations:
+            # Check if the rpc method does not have
+            # any rpc capabilities
+            if not entry.rpc_method_authorizations[method]:
+                # Do not need to update agent capabilities
+                # if no capabilities in auth file
+                continue
+            modified_methods[method] = entry.rpc_method_authorizations[
+                method
+            ]
+        if modified_methods:
+            method_error = True
+            try:
+                self.vip.rpc.call(
+                    entry.identity,
+                    "auth.set_multiple_rpc_authorizations",
+                    rpc_authorizations=modified_methods,
+                ).wait(timeout=4)
+                method_error = False
+            except gevent.Timeout:
+                _log.error(
+                    f"{entry.identity} "
+                    f"has timed out while attempting "
+                    f"to update rpc_method_authorizations"
+                )
+                method_error = False
+            except RemoteError:
+                method_error = True
+
+            # One or more methods are invalid, need to iterate
+            if method_error:
+                for method in modified_methods:
                     try:
                         self.vip.rpc.call(
                             entry.identity,
-                            "auth.set_multiple_rpc_authorizations",
-                            rpc_authorizations=modified_methods,
-                        ).wait(timeout=4)
-                        method_error = False
+                            "auth.set_rpc_authorizations",
+                            method_str=method,
+                            capabilities=
+                            entry.rpc_method_authorizations[
+                                method
+                            ],
+                        )
                     except gevent.Timeout:
                         _log.error(
                             f"{entry.identity} "
                             f"has timed out while attempting "
-                            f"to update rpc_method_authorizations"
+                            f"to update "
+                            f"rpc_method_authorizations"
                         )
-                        method_error = False
                     except RemoteError:
-                        method_error = True
-
-                    # One or more methods are invalid, need to iterate
-                    if method_error:
-                        for method in modified_methods:
-                            try:
-                                self.vip.rpc.call(
-                                    entry.identity,
-                                    "auth.set_rpc_authorizations",
-                                    method_str=method,
-                                    capabilities=
-                                    entry.rpc_method_authorizations[
-                                        method
-                                    ],
-                                )
-                            except gevent.Timeout:
-                                _log.error(
-                                    f"{entry.identity} "
-                                    f"has timed out while attempting "
-                                    f"to update "
-                                    f"rpc_method_authorizations"
-                                )
-                            except RemoteError:
-                                _log.error(f"Method {method} does not exist.")
+                        _log.error(f"Method {method} does not exist.")
 
     @RPC.export
     def add_rpc_authorizations(self, identity, method, authorizations):
@@ -346,30 +380,29 @@ class AuthService(Agent):
         method
         :return: None
         """
-        if identity in PROCESS_IDENTITIES or identity == CONTROL_CONNECTION:
+        if identity in _SKIP_IDENTITIES:
             _log.error(f"{identity} cannot be modified using this command!")
             return
-        entries = copy.deepcopy(self.auth_file.read_allow_entries())
-        for entry in entries:
-            if entry.identity == identity:
-                if method not in entry.rpc_method_authorizations:
-                    entry.rpc_method_authorizations[method] = authorizations
-                elif not entry.rpc_method_authorizations[method]:
-                    entry.rpc_method_authorizations[method] = authorizations
-                else:
-                    entry.rpc_method_authorizations[method].extend(
-                        [
-                            rpc_auth
-                            for rpc_auth in authorizations
-                            if rpc_auth in authorizations
-                               and rpc_auth
-                               not in entry.rpc_method_authorizations[method]
-                        ]
-                    )
-                self.auth_file.update_by_index(entry, entries.index(entry))
-                return
-        _log.error("Agent identity not found in auth file!")
-        return
+        hit = self._entries_by_identity.get(identity)
+        if hit is None:
+            _log.error("Agent identity not found in auth file!")
+            return
+        index, entry = hit
+        entry = copy.deepcopy(entry)
+        if method not in entry.rpc_method_authorizations:
+            entry.rpc_method_authorizations[method] = authorizations
+        elif not entry.rpc_method_authorizations[method]:
+            entry.rpc_method_authorizations[method] = authorizations
+        else:
+            existing = set(entry.rpc_method_authorizations[method])
+            entry.rpc_method_authorizations[method].extend(
+                [
+                    rpc_auth
+                    for rpc_auth in authorizations
+                    if rpc_auth not in existing
+                ]
+            )
+        self.auth_file.update_by_index(entry, index)
 
     @RPC.export
     def delete_rpc_authorizations(
@@ -387,78 +420,97 @@ class AuthService(Agent):
         the RPC exported method
         :return: None
         """
-        if identity in PROCESS_IDENTITIES or identity == CONTROL_CONNECTION:
+        if identity in _SKIP_IDENTITIES:
             _log.error(f"{identity} cannot be modified using this command!")
             return
-        entries = copy.deepcopy(self.auth_file.read_allow_entries())
-        for entry in entries:
-            if entry.identity == identity:
-                if method not in entry.rpc_method_authorizations:
-                    _log.error(
-                        f"{entry.identity} does not have a method called "
-                        f"{method}"
-                    )
-                elif not entry.rpc_method_authorizations[method]:
+        hit = self._entries_by_identity.get(identity)
+        if hit is None:
+            _log.error("Agent identity not found in auth file!")
+            return
+        index, entry = hit
+        if method not in entry.rpc_method_authorizations:
+            _log.error(
+                f"{entry.identity} does not have a method called "
+                f"{method}"
+            )
+        elif not entry.rpc_method_authorizations[method]:
+            _log.error(
+                f"{entry.identity}.{method} does not have any "
+                f"authorized capabilities."
+            )
+        else:
+            any_match = False
+            authorized = set(entry.rpc_method_authorizations[method])
+            for rpc_auth in denied_authorizations:
+                if rpc_auth not in authorized:
                     _log.error(
-                        f"{entry.identity}.{method} does not have any "
-                        f"authorized capabilities."
+                        f"{rpc_auth} is not an authorized capability "
+                        f"for {method}"
                     )
                 else:
-                    any_match = False
-                    for rpc_auth in denied_authorizations:
-                        if (
-                                rpc_auth
-                                not in entry.rpc_method_authorizations[method]
-                        ):
-                            _log.error(
-                                f"{rpc_auth} is not an authorized capability "
-                                f"for {method}"
-                            )
-                        else:
-                            any_match = True
-                    if any_match:
-                        entry.rpc_method_authorizations[method] = [
-                            rpc_auth
-                            for rpc_auth in entry.rpc_method_authorizations[
-                                method
-                            ]
-                            if rpc_auth not in denied_authorizations
-                        ]
-                        if not entry.rpc_method_authorizations[method]:
-                            entry.rpc_method_authorizations[method] = [""]
-                        self.auth_file.update_by_index(
-                            entry, entries.index(entry)
-                        )
-                    else:
-                        _log.error(
-                            f"No matching authorized capabilities provided "
-                            f"for {method}"
-                        )
-                return
-        _log.error("Agent identity not found in auth file!")
-        return
+                    any_match = True
+            if any_match:
+                entry = copy.deepcopy(entry)
+                denied = set(denied_authorizations)
+                entry.rpc_method_authorizations[method] = [
+                    rpc_auth
+                    for rpc_auth in entry.rpc_method_authorizations[method]
+                    if rpc_auth not in denied
+                ]
+                if not entry.rpc_method_authorizations[method]:
+                    entry.rpc_method_authorizations[method] = [""]
+                self.auth_file.update_by_index(entry, index)
+            else:
+                _log.error(
+                    f"No matching authorized capabilities provided "
+                    f"for {method}"
+                )
 
     def _update_auth_lists(self, entries, is_allow=True):
-        auth_list = []
+        """
+        Sync the approved (or denied) credentials, keyed by user_id, with the
+        entries read from the auth file. Unchanged credentials are left in
+        place so their retry counts survive a reload.
+        """
+        auth_dict = self._auth_approved if is_allow else self._auth_denied
+        user_ids = set()
         for entry in entries:
-            auth_list.append(
-                {
-                    "domain": entry.domain,
-                    "address": entry.address,
-                    "mechanism": entry.mechanism,
-                    "credentials": entry.credentials,
-                    "user_id": entry.user_id,
-                    "retries": 0,
-                }
-            )
-        if is_allow:
-            self._auth_approved = [
-                entry for entry in auth_list if entry["address"] is not None
-            ]
-        else:
-            self._auth_denied = [
-                entry for entry in auth_list if entry["address"] is not None
-            ]
+            if entry.address is None:
+                continue
+            user_ids.add(entry.user_id)
+            existing = auth_dict.get(entry.user_id)
+            if (
+                    existing is not None
+                    and existing["domain"] == entry.domain
+                    and existing["address"] == entry.address
+                    and existing["mechanism"] == entry.mechanism
+                    and existing["credentials"] == entry.credentials
+            ):
+                continue
+            auth_dict[entry.user_id] = {
+                "domain": entry.domain,
+                "address": entry.address,
+                "mechanism": entry.mechanism,
+                "credentials": entry.credentials,
+                "user_id": entry.user_id,
+                "retries": 0,
+            }
+        for user_id in [uid for uid in auth_dict if uid not in user_ids]:
+            del auth_dict[user_id]
+        if not is_allow:
+            # Only entries with plain string fields can equal the strings of
+            # a ZAP request. List fields never do and are not hashable.
+            denied_by_key = {}
+            for denied in auth_dict.values():
+                key = (
+                    denied["domain"],
+                    denied["address"],
+                    denied["mechanism"],
+                    denied["credentials"],
+                )
+                if all(field is None or isinstance(field, str) for field in key):
+                    denied_by_key[key] = denied
+            self._auth_denied_by_key = denied_by_key
 
     def _get_updated_entries(self, old_entries, new_entries):
         """
@@ -470,52 +522,48 @@ class AuthService(Agent):
         :type new_entries: list
         :return: modified_entries
         """
+        old_by_identity = {
+            old_entry.identity: old_entry for old_entry in old_entries
+        }
         modified_entries = []
         for entry in new_entries:
+            if entry.identity is None or entry.identity in _SKIP_IDENTITIES:
+                continue
+            old_entry = old_by_identity.get(entry.identity)
             if (
-                    entry.identity is not None
-                    and entry.identity not in PROCESS_IDENTITIES
-                    and entry.identity != CONTROL_CONNECTION
+                    old_entry is None
+                    or entry.rpc_method_authorizations
+                    != old_entry.rpc_method_authorizations
             ):
-
-                for old_entry in old_entries:
-                    if entry.identity == old_entry.identity:
-                        if (
-                                entry.rpc_method_authorizations
-                                != old_entry.rpc_method_authorizations
-                        ):
-                            modified_entries.append(entry)
-                        else:
-                            pass
-                    else:
-                        pass
-                if entry.identity not in [
-                    old_entry.identity for old_entry in old_entries
-                ]:
-                    modified_entries.append(entry)
-            else:
-                pass
+                modified_entries.append(entry)
         return modified_entries
 
     def read_auth_file(self):
         _log.info("loading auth file %s", self.auth_file_path)
         # Update from auth file into memory
         if self.auth_file.auth_data:
-            old_entries = self.auth_file.read_allow_entries().copy()
-            self.auth_file.load()
-            entries = self.auth_file.read_allow_entries()
-            count = 0
+            # The entries parsed on the previous load are still indexed by
+            # identity, so there is no need to reparse the old auth data
+            old_entries = [
+                entry for _, entry in self._entries_by_identity.values()
+            ]
             # Allow for multiple tries to ensure auth file is read
-            while not entries and count < 3:
+            for _ in range(4):
                 self.auth_file.load()
-                entries = self.auth_file.read_allow_entries()
-                count += 1
+                entries, denied_entries = self.auth_file.read()[:2]
+                if entries:
+                    break
             modified_entries = self._get_updated_entries(old_entries, entries)
-            denied_entries = self.auth_file.read_deny_entries()
         else:
             self.auth_file.load()
-            entries = self.auth_file.read_allow_entries()
-            denied_entries = self.auth_file.read_deny_entries()
+            entries, denied_entries = self.auth_file.read()[:2]
+        # Index allow entries by identity using their position in the auth
+        # file so RPC updates don't have to rescan and reparse it
+        entries_by_identity = {}
+        for index, entry in enumerate(entries):
+            if entry.identity is not None:
+                entries_by_identity.setdefault(entry.identity, (index, entry))
+        self._entries_by_identity = entries_by_identity
         # Populate auth lists with current entries
         self._update_auth_lists(entries)
         self._update_auth_lists(denied_entries, is_allow=False)
@@ -523,6 +571,10 @@ class AuthService(Agent):
         # sort the entries so the regex credentials follow the concrete creds
         entries.sort()
         self.auth_entries = entries
+        if self.authentication_server is not None:
+            self.authentication_server.update_auth_entries(entries)
+        self._user_to_caps_cache = None
+        self._authz_cache.clear()
         if self._is_connected:
             try:
                 _log.debug("Sending auth updates to peers")
@@ -564,6 +616,41 @@ class AuthService(Agent):
         :type modified_entries: list
         """
         user_to_caps = self.get_user_to_capabilities()
+        peers = self._get_peers()
+        if not peers:
+            raise BaseException("No peers connected to the platform")
+
+        _log.debug("after getting peerlist to send auth updates")
+
+        # rpc.call only sends the request, so these go out back-to-back
+        # without waiting on each peer
+        skip_peers = (self.core.identity, CONTROL_CONNECTION)
+        for peer in peers:
+            if peer not in skip_peers:
+                _log.debug("Sending auth update to peers %s", peer)
+                self.vip.rpc.call(peer, "auth.update", user_to_caps)
+
+        # Update RPC method authorizations on agents
+        if modified_entries:
+            try:
+                gevent.spawn(
+                    self.update_rpc_authorizations, modified_entries
+                ).join(timeout=15)
+            except gevent.Timeout:
+                _log.error("Timed out updating methods from auth file!")
+        self.authorization_server.update_user_capabilites(self.get_user_to_capabilities())
+
+    def _get_peers(self):
+        """
+        Returns the connected peers, reusing the last successful peerlist
+        for back-to-back auth updates.
+        """
+        now = time.time()
+        if (
+                self._peerlist_cache
+                and now - self._peerlist_cache_time < _PEERLIST_CACHE_TTL
+        ):
+            return self._peerlist_cache
         i = 0
         peers = None
         # peerlist times out lots of times when running test suite. This
@@ -582,26 +669,13 @@ class AuthService(Agent):
                 )
                 peers = list(self.vip.peerlist.peers_list)
                 _log.warning("Get list of peers from subsystem directly")
+        if peers:
+            self._peerlist_cache = peers
+            self._peerlist_cache_time = now
+        return peers
 
-        if not peers:
-            raise BaseException("No peers connected to the platform")
-
-        _log.debug("after getting peerlist to send auth updates")
-
-        for peer in peers:
-            if peer not in [self.core.identity, CONTROL_CONNECTION]:
-                _log.debug(f"Sending auth update to peers {peer}")
-                self.vip.rpc.call(peer, "auth.update", user_to_caps)
-
-        # Update RPC method authorizations on agents
-        if modified_entries:
-            try:
-                gevent.spawn(
-                    self.update_rpc_authorizations, modified_entries
-                ).join(timeout=15)
-            except gevent.Timeout:
-                _log.error("Timed out updating methods from auth file!")
-        self.authorization_server.update_user_capabilites(self.get_user_to_capabilities())
+    def _invalidate_peerlist_cache(self, sender, **kwargs):
+        self._peerlist_cache = None
 
     @RPC.export
     def get_user_to_capabilities(self):
@@ -612,10 +686,13 @@ class AuthService(Agent):
         :returns: mapping of users to capabilities
         :rtype: dict
         """
-        user_to_caps = {}
-        for entry in self.auth_entries:
-            user_to_caps[entry.user_id] = entry.capabilities
-        return user_to_caps
+        # Cached until read_auth_file installs new auth entries
+        if self._user_to_caps_cache is None:
+            user_to_caps = {}
+            for entry in self.auth_entries:
+                user_to_caps[entry.user_id] = entry.capabilities
+            self._user_to_caps_cache = user_to_caps
+        return self._user_to_caps_cache
 
     @RPC.export
     def get_authorizations(self, user_id):
@@ -630,7 +707,7 @@ class AuthService(Agent):
         """
         use_parts = True
         try:
-            domain, address, mechanism, credentials = load_user(user_id)
+            domain, address, mechanism, credentials = _load_user(user_id)
         except ValueError:
             use_parts = False
         for entry in self.auth_entries:
@@ -757,12 +834,46 @@ class AuthService(Agent):
         """
         return self.authorization_server.get_denied_authorizations()
 
+    @RPC.export
+    def invalidate_authz_cache(self):
+        """RPC method
+
+        Clears the cached capabilities, groups and roles returned by
+        get_all_authorizations, get_capabilities, get_groups and get_roles.
+        The cache is also cleared whenever the auth file is reloaded.
+        """
+        self._authz_cache.clear()
+
+    @RPC.export
+    def get_all_authorizations(self, user_id):
+        """RPC method
+
+        Gets capabilities, groups, and roles for a given user in one call.
+        Unlike get_authorizations, results are cached and an unknown user
+        gets empty lists.
+
+        :param user_id: user id field from VOLTTRON Interconnect Protocol
+        :type user_id: str
+        :returns: list of capability-list, group-list, role-list
+        :rtype: list
+        """
+        # Unknown users are cached too, so repeated lookups stay cheap
+        cache = self._authz_cache
+        now = time.time()
+        cached = cache.get(user_id)
+        if cached is None or now - cached[0] >= _AUTHZ_TTL:
+            cache.pop(user_id, None)
+            if len(cache) >= _AUTHZ_CACHE_SIZE:
+                # Evict the oldest lookup
+                del cache[next(iter(cache))]
+            auths = self.get_authorizations(user_id)
+            cached = (now, list(auths) if auths else [[], [], []])
+            cache[user_id] = cached
+        return cached[1]
+
     def _get_authorizations(self, user_id, index):
         """Convenience method for getting authorization component by index"""
-        auths = self.get_authorizations(user_id)
-        if auths:
-            return auths[index]
-        return []
+        return self.get_all_authorizations(user_id)[index]
 
     @RPC.export
     def get_capabilities(self, user_id):
@@ -437,7 +437,7 @@ class AuthFile(object):
             else:
                 deny_entries.append(auth_entry)
             self._write(allow_entries, deny_entries, groups, roles)
-            _log.debug("Added auth entry {} ".format(auth_entry))
+            _log.debug("Added auth entry %s", auth_entry)
         gevent.sleep(1)
 
     def approve_deny_credential(self, user_id, is_approved=True):
@@ -111,6 +111,13 @@ class BaseServerAuthentication(BaseAuthentication):
     def handle_authentication(self, protected_topics):
         pass
 
+    def update_auth_entries(self, auth_entries):
+        """
+        Called with the enabled, sorted auth entries every time the auth
+        file is loaded.
+        """
+        pass
+
     def stop_authentication(self):
         pass
 
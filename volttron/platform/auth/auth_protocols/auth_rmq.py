@@ -347,25 +347,25 @@ class RMQAuthorization(BaseServerAuthorization):
             )
             _log.debug("Created cert and permissions for user: %r", user_id)
         except ValueError as err:
-            _log.error(f"{err}")
+            _log.error("%s", err)
 
     def deny_authorization(self, user_id):
         try:
             self._certs.deny_csr(user_id)
-            _log.debug("Denied cert for user: {}".format(user_id))
+            _log.debug("Denied cert for user: %s", user_id)
         # Stores error message in case it is caused by an unexpected
         # failure
         except ValueError as err:
-            _log.error(f"{err}")
+            _log.error("%s", err)
 
     def delete_authorization(self, user_id):
         try:
             self._certs.delete_csr(user_id)
-            _log.debug("Denied cert for user: {}".format(user_id))
+            _log.debug("Denied cert for user: %s", user_id)
         # Stores error message in case it is caused by an unexpected
         # failure
         except ValueError as err:
-            _log.error(f"{err}")
+            _log.error("%s", err)
 
     def update_user_capabilites(self, user_to_caps):
         self._user_to_caps = user_to_caps
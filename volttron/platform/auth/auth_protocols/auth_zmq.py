@@ -51,7 +51,7 @@ from volttron.platform import get_home
 from volttron.platform import jsonapi
 from volttron.platform.auth.auth_entry import AuthEntry
 from volttron.platform.auth.auth_exception import AuthException
-from volttron.platform.auth.auth_utils import dump_user
+from volttron.platform.auth.auth_utils import dump_user, isregex
 from volttron.platform.keystore import KeyStore, KnownHostsStore
 from volttron.platform.parameters import Parameters
 from volttron.platform.vip.socket import encode_key
@@ -62,6 +62,48 @@ from volttron.platform.agent.utils import (
 
 _log = logging.getLogger(__name__)
 
+# Upper bound on remembered auth entry lookups in
+# ZMQServerAuthentication.authenticate
+_AUTHENTICATE_CACHE_SIZE = 2048
+
+# Key frames for updates sent to the router's pubsub subsystem
+_AUTH_UPDATE_FRAME = zmq.Frame(b"auth_update")
+_PROTECTED_UPDATE_FRAME = zmq.Frame(b"protected_update")
+
+
+class PendingAuthEntry:
+    """
+    A ZMQ credential that failed authentication and is waiting to be
+    approved, denied or deleted. Uses __slots__ since one is kept for every
+    unknown credential that connects.
+    """
+
+    __slots__ = (
+        "domain",
+        "address",
+        "mechanism",
+        "credentials",
+        "user_id",
+        "retries",
+    )
+
+    def __init__(self, domain, address, mechanism, credentials, user_id,
+                 retries=1):
+        self.domain = domain
+        self.address = address
+        self.mechanism = mechanism
+        self.credentials = credentials
+        self.user_id = user_id
+        self.retries = retries
+
+    @property
+    def key(self):
+        return self.domain, self.address, self.mechanism, self.credentials
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 @dataclass
 class ZMQClientParameters(Parameters):
     address: str = None 
@@ -187,22 +229,33 @@ class ZMQServerAuthentication(BaseServerAuthentication):
         self.zap_socket = None
         self._zap_greenlet = None
         self.authorization = ZMQAuthorization(self.auth_service)
-        
+        self._authenticate_cache = {}
+        self._exact_auth_entries = {}
+        self._other_auth_entries = []
+        self.update_auth_entries(self.auth_service.auth_entries)
+
     def setup_authentication(self):
         self.zap_socket = zmq.Socket(zmq.Context.instance(), zmq.ROUTER)
         self.zap_socket.bind("inproc://zeromq.zap.01")
 
     def authenticate(self, domain, address, mechanism, credentials):
-        for entry in self.auth_service.auth_entries:
-            # _log.info(f"Auth entry: {entry}")
-            # _log.info(f"Incoming auth: \n"
-            #           f"domain: {domain}\n"
-            #           f"address: {address}\n"
-            #           f"mechanism: {mechanism}")
-            if entry.match(domain, address, mechanism, credentials):
-                return entry.user_id or dump_user(
-                    domain, address, mechanism, *credentials[:1]
-                )
+        # Auth entry lookups are cached until the auth file is reloaded
+        cache = self._authenticate_cache
+        key = (
+            domain, address, mechanism, credentials[0] if credentials else None
+        )
+        try:
+            user = cache[key]
+        except KeyError:
+            user = self._match_auth_entries(
+                domain, address, mechanism, credentials
+            )
+            if len(cache) >= _AUTHENTICATE_CACHE_SIZE:
+                # Evict the oldest lookup
+                del cache[next(iter(cache))]
+            cache[key] = user
+        if user:
+            return user
         if mechanism == "NULL" and address.startswith("localhost:"):
             parts = address.split(":")[1:]
             if len(parts) > 2:
@@ -216,6 +269,55 @@ class ZMQServerAuthentication(BaseServerAuthentication):
         if self.auth_service.allow_any:
             return dump_user(domain, address, mechanism, *credentials[:1])
 
+    def update_auth_entries(self, auth_entries):
+        """
+        Indexes the auth entries for authenticate. Entries with a single
+        concrete credential can be looked up by (mechanism, credential).
+        NULL, regex and multi-credential entries keep their position so
+        authenticate can honor the sort order.
+        """
+        exact_entries = {}
+        other_entries = []
+        for position, entry in enumerate(auth_entries):
+            if (
+                    entry.mechanism != "NULL"
+                    and isinstance(entry.credentials, str)
+                    and not isregex(entry.credentials)
+            ):
+                exact_entries.setdefault(
+                    (entry.mechanism, entry.credentials), []
+                ).append((position, entry))
+            else:
+                other_entries.append((position, entry))
+        self._exact_auth_entries = exact_entries
+        self._other_auth_entries = other_entries
+        self._authenticate_cache.clear()
+
+    def _match_auth_entries(self, domain, address, mechanism, credentials):
+        """Returns the user for the first auth entry matching the request."""
+        match = None
+        if credentials:
+            candidates = self._exact_auth_entries.get(
+                (mechanism, credentials[0]), ()
+            )
+            for position, entry in candidates:
+                if entry.match(domain, address, mechanism, credentials):
+                    match = entry
+                    break
+        # Entries that can't be looked up by credential only win if they
+        # come before the exact match in the auth entries
+        for other_position, entry in self._other_auth_entries:
+            if match is not None and other_position > position:
+                break
+            if entry.match(domain, address, mechanism, credentials):
+                match = entry
+                break
+        if match is None:
+            return None
+        return match.user_id or dump_user(
+            domain, address, mechanism, *credentials[:1]
+        )
+
     def handle_authentication(self, protected_topics):
         """
         The zap loop is the starting of the authentication process for
@@ -301,7 +403,7 @@ class ZMQServerAuthentication(BaseServerAuthentication):
                             userid,
                         )
                         response.extend([b"200", b"SUCCESS", b"", b""])
-                        _log.debug("AUTH response: {}".format(response))
+                        _log.debug("AUTH response: %s", response)
                         sock.send_multipart(response)
                     else:
                         if type(userid) == bytes:
@@ -356,148 +458,113 @@ class ZMQServerAuthentication(BaseServerAuthentication):
             user_id
     ):
         """Handles incoming pending auth entries."""
-        for entry in self.auth_service._auth_denied:
-            # Check if failure entry has been denied. If so, increment the
-            # failure's denied count
-            if (
-                    (entry["domain"] == domain)
-                    and (entry["address"] == address)
-                    and (entry["mechanism"] == mechanism)
-                    and (entry["credentials"] == credential)
-            ):
-                entry["retries"] += 1
-                return
-
-        for entry in self.auth_service._auth_pending:
-            # Check if failure entry exists. If so, increment the failure count
-            if (
-                    (entry["domain"] == domain)
-                    and (entry["address"] == address)
-                    and (entry["mechanism"] == mechanism)
-                    and (entry["credentials"] == credential)
-            ):
-                entry["retries"] += 1
-                return
+        key = (domain, address, mechanism, credential)
+        # Check if failure entry has been denied. If so, increment the
+        # failure's denied count
+        entry = self.auth_service._auth_denied_by_key.get(key)
+        if entry is not None:
+            entry["retries"] += 1
+            return
+
+        # Check if failure entry exists. If so, increment the failure count
+        entry = self.auth_service._auth_pending_by_key.get(key)
+        if entry is not None:
+            entry.retries += 1
+            return
         # Add a new failure entry
-        fields = {
-            "domain": domain,
-            "address": address,
-            "mechanism": mechanism,
-            "credentials": credential,
-            "user_id": user_id,
-            "retries": 1,
-        }
-        self.auth_service._auth_pending.append(dict(fields))
+        entry = PendingAuthEntry(domain, address, mechanism, credential, user_id)
+        self.auth_service._auth_pending[user_id] = entry
+        self.auth_service._auth_pending_by_key[key] = entry
         return
 
 class ZMQAuthorization(BaseServerAuthorization):
+    _SETUP_MODE_COMMENT = "Auth entry added in setup mode"
+    # AuthEntry stores an empty rpc_method_authorizations as None, so this
+    # dict is never shared between entries
+    _NO_RPC_AUTHORIZATIONS = {}
+
     def __init__(self, auth_service):
         super().__init__(auth_service=auth_service)
-        
+        self._user_to_caps = None
+        self._user_to_caps_json = None
+        self._last_auth_update_payload = None
+        self._last_protected_update_payload = None
+
     def create_authenticated_address(self):
         pass
 
     def approve_authorization(self, user_id):
-        index = 0
-        matched_index = -1
-        for pending in self.auth_service._auth_pending:
-            if user_id == pending["user_id"]:
-                self._update_auth_entry(
-                    pending["domain"],
-                    pending["address"],
-                    pending["mechanism"],
-                    pending["credentials"],
-                    pending["user_id"],
-                )
-                matched_index = index
-                break
-            index = index + 1
-        if matched_index >= 0:
-            del self.auth_service._auth_pending[matched_index]
-
-        for pending in self.auth_service._auth_denied:
-            if user_id == pending["user_id"]:
-                self.auth_service.auth_file.approve_deny_credential(
-                    user_id, is_approved=True
-                )
+        self._resolve_pending(user_id, "approve")
+        if user_id in self.auth_service._auth_denied:
+            self.auth_service.auth_file.approve_deny_credential(
+                user_id, is_approved=True
+            )
 
     def deny_authorization(self, user_id):
-        index = 0
-        matched_index = -1
-        for pending in self.auth_service._auth_pending:
-            if user_id == pending["user_id"]:
-                self._update_auth_entry(
-                    pending["domain"],
-                    pending["address"],
-                    pending["mechanism"],
-                    pending["credentials"],
-                    pending["user_id"],
-                    is_allow=False,
-                )
-                matched_index = index
-                break
-            index = index + 1
-        if matched_index >= 0:
-            del self.auth_service._auth_pending[matched_index]
-
-        for pending in self.auth_service._auth_approved:
-            if user_id == pending["user_id"]:
-                self.auth_service.auth_file.approve_deny_credential(
-                    user_id, is_approved=False
-                )
+        self._resolve_pending(user_id, "deny")
+        if user_id in self.auth_service._auth_approved:
+            self.auth_service.auth_file.approve_deny_credential(
+                user_id, is_approved=False
+            )
 
     def delete_authorization(self, user_id):
-        index = 0
-        matched_index = -1
-        for pending in self.auth_service._auth_pending:
-            if user_id == pending["user_id"]:
-                self._update_auth_entry(
-                    pending["domain"],
-                    pending["address"],
-                    pending["mechanism"],
-                    pending["credentials"],
-                    pending["user_id"],
-                )
-                matched_index = index
-                val_err = None
-                break
-            index = index + 1
-        if matched_index >= 0:
-            del self.auth_service._auth_pending[matched_index]
-
-        index = 0
-        matched_index = -1
-        for pending in self.auth_service._auth_pending:
-            if user_id == pending["user_id"]:
-                matched_index = index
-                val_err = None
-                break
-            index = index + 1
-        if matched_index >= 0:
-            del self.auth_service._auth_pending[matched_index]
-
-        for pending in self.auth_service._auth_approved:
-            if user_id == pending["user_id"]:
-                self._remove_auth_entry(pending["credentials"])
-                val_err = None
-
-        for pending in self.auth_service._auth_denied:
-            if user_id == pending["user_id"]:
-                self._remove_auth_entry(pending["credentials"], is_allow=False)
-                val_err = None
-
-        # If the user_id supplied was not for a ZMQ credential, and the
-        # pending_csr check failed,
-        # output the ValueError message to the error log.
-        if val_err:
-            _log.error(f"{val_err}")
+        handled = self._resolve_pending(user_id, "delete") is not None
+
+        approved = self.auth_service._auth_approved.get(user_id)
+        if approved is not None:
+            self._remove_auth_entry(approved["credentials"])
+            handled = True
+
+        denied = self.auth_service._auth_denied.get(user_id)
+        if denied is not None:
+            self._remove_auth_entry(denied["credentials"], is_allow=False)
+            handled = True
+
+        # If the user_id supplied was not for a ZMQ credential,
+        # output an error message to the error log.
+        if not handled:
+            _log.error("No ZMQ credential found for user_id %s", user_id)
+
+    def _resolve_pending(self, user_id, action):
+        """
+        Removes the pending credential for user_id and, unless the action is
+        "delete", adds it to the allow ("approve") or deny ("deny") list.
+
+        :param user_id: user id of the pending credential
+        :param action: one of "approve", "deny" or "delete"
+        :return: the resolved pending entry or None
+        """
+        pending = self.auth_service._auth_pending.pop(user_id, None)
+        if pending is None:
+            return None
+        self.auth_service._auth_pending_by_key.pop(pending.key, None)
+        if action != "delete":
+            self._update_auth_entry(
+                pending.domain,
+                pending.address,
+                pending.mechanism,
+                pending.credentials,
+                pending.user_id,
+                is_allow=action == "approve",
+            )
+        return pending
 
     def update_user_capabilites(self, user_to_caps):
-        # Send auth update message to router
-        json_msg = jsonapi.dumpb(dict(capabilities=user_to_caps))
-        frames = [zmq.Frame(b"auth_update"), zmq.Frame(json_msg)]
+        # Send auth update message to router. AuthService hands out the
+        # same mapping until the auth file changes, so reuse its encoding.
+        if user_to_caps is not self._user_to_caps:
+            self._user_to_caps = user_to_caps
+            self._user_to_caps_json = jsonapi.dumpb(
+                dict(capabilities=user_to_caps)
+            )
+        json_msg = self._user_to_caps_json
+        # The router already has these capabilities
+        if json_msg == self._last_auth_update_payload:
+            return
+        frames = [_AUTH_UPDATE_FRAME, zmq.Frame(json_msg)]
         # <recipient, subsystem, args, msg_id, flags>
         self.auth_service.core.socket.send_vip(b"", b"pubsub", frames, copy=False)
+        self._last_auth_update_payload = json_msg
 
     def load_protected_topics(self, protected_topics_data):
         protected_topics = super().load_protected_topics(protected_topics_data)
@@ -507,15 +574,16 @@ class ZMQAuthorization(BaseServerAuthorization):
     def update_protected_topics(self, protected_topics):
         from volttron.platform.vip.agent.errors import VIPError
         protected_topics_msg = jsonapi.dumpb(protected_topics)
+        # The router already has these protected topics
+        if protected_topics_msg == self._last_protected_update_payload:
+            return
 
-        frames = [
-            zmq.Frame(b"protected_update"),
-            zmq.Frame(protected_topics_msg),
-        ]
+        frames = [_PROTECTED_UPDATE_FRAME, zmq.Frame(protected_topics_msg)]
         if self.auth_service._is_connected:
             try:
                 # <recipient, subsystem, args, msg_id, flags>
                 self.auth_service.core.socket.send_vip(b"", b"pubsub", frames, copy=False)
+                self._last_protected_update_payload = protected_topics_msg
             except VIPError as ex:
                 _log.error(
                     "Error in sending protected topics update to clear "
@@ -534,63 +602,63 @@ class ZMQAuthorization(BaseServerAuthorization):
     ):
         """Adds a pending auth entry to AuthFile."""
         # Make a new entry
-        fields = {
-            "domain": domain,
-            "address": address,
-            "mechanism": mechanism,
-            "credentials": credential,
-            "user_id": user_id,
-            "groups": "",
-            "roles": "",
-            "capabilities": "",
-            "rpc_method_authorizations": {},
-            "comments": "Auth entry added in setup mode",
-        }
-        new_entry = AuthEntry(**fields)
+        new_entry = AuthEntry(
+            domain=domain,
+            address=address,
+            mechanism=mechanism,
+            credentials=credential,
+            user_id=user_id,
+            groups="",
+            roles="",
+            capabilities="",
+            rpc_method_authorizations=self._NO_RPC_AUTHORIZATIONS,
+            comments=self._SETUP_MODE_COMMENT,
+        )
 
         try:
             self.auth_service.auth_file.add(new_entry, overwrite=False, is_allow=is_allow)
         except AuthException as err:
-            _log.error("ERROR: %s\n", str(err))
+            _log.error("ERROR: %s", err)
 
     def _remove_auth_entry(self, credential, is_allow=True):
         try:
             self.auth_service.auth_file.remove_by_credentials(credential, is_allow=is_allow)
         except AuthException as err:
-            _log.error("ERROR: %s\n", str(err))
+            _log.error("ERROR: %s", err)
 
     def get_authorization(self, user_id):
-        for auth_entry in self.auth_service._auth_pending:
-            if user_id == auth_entry.user_id:
-                return str(auth_entry.credentials)
-        for auth_entry in self.auth_service._auth_approved:
-            if user_id == auth_entry.user_id:
-                return str(auth_entry.credentials)
-        for auth_entry in self.auth_service._auth_denied:
-            if user_id == auth_entry.user_id:
-                return str(auth_entry.credentials)
+        pending = self.auth_service._auth_pending.get(user_id)
+        if pending is not None:
+            return str(pending.credentials)
+        for auth_dict in (
+                self.auth_service._auth_approved,
+                self.auth_service._auth_denied,
+        ):
+            auth_entry = auth_dict.get(user_id)
+            if auth_entry is not None:
+                return str(auth_entry["credentials"])
         return ""
 
     def get_authorization_status(self, user_id):
-        for auth_entry in self.auth_service._auth_pending:
-            if user_id == auth_entry.user_id:
-                return "PENDING"
-        for auth_entry in self.auth_service._auth_approved:
-            if user_id == auth_entry.user_id:
-                return "APPROVED"
-        for auth_entry in self.auth_service._auth_denied:
-            if user_id == auth_entry.user_id:
-                return "DENIED"
+        if user_id in self.auth_service._auth_pending:
+            return "PENDING"
+        if user_id in self.auth_service._auth_approved:
+            return "APPROVED"
+        if user_id in self.auth_service._auth_denied:
+            return "DENIED"
         return "UNKOWN"
 
     def get_pending_authorizations(self):
-        return list(self.auth_service._auth_pending)
+        return [
+            pending.to_dict()
+            for pending in self.auth_service._auth_pending.values()
+        ]
 
     def get_approved_authorizations(self):
-        return list(self.auth_service._auth_approved)
+        return list(self.auth_service._auth_approved.values())
 
     def get_denied_authorizations(self):
-        return list(self.auth_service._auth_denied)
+        return list(self.auth_service._auth_denied.values())
 
 
 class ZMQClientAuthorization(BaseClientAuthorization):
@@ -84,6 +84,7 @@ class RMQRouter:
         self.default_user_id = default_user_id
         self._peers = set()
         self._peers_with_messagebus = dict()
+        self._user_access_tokens = dict()
         self.addresses = [Address(addr) for addr in set(addresses)]
         self.local_address = Address(local_address)
         self._address = address
@@ -328,13 +329,16 @@ class RMQRouter:
                 self.connection.send_vip_object(message)
 
     def _make_user_access_tokens(self, identity):
-        tokens = dict()
-        tokens["configure"] = tokens["read"] = tokens["write"] = [identity,
-                                                                  identity + ".pubsub.*",
-                                                                  identity + ".zmq.*"]
-        tokens["read"].append("volttron")
-        tokens["write"].append("volttron")
-
+        # The allowed tokens only depend on the identity, so the frozensets
+        # are built once per identity and reused by _check_token
+        tokens = self._user_access_tokens.get(identity)
+        if tokens is None:
+            allowed = frozenset([identity,
+                                 identity + ".pubsub.*",
+                                 identity + ".zmq.*",
+                                 "volttron"])
+            tokens = dict(configure=allowed, read=allowed, write=allowed)
+            self._user_access_tokens[identity] = tokens
         return tokens
 
     def _check_user_access_token(self, actual, allowed):
@@ -369,11 +373,8 @@ class RMQRouter:
         :param allowed: allowed permission
         :return: returns missing permissions
         """
-        pending = actual[:]
-        for tk in actual:
-            if tk in allowed:
-                pending.remove(tk)
-        return pending
+        allowed_set = allowed if isinstance(allowed, (set, frozenset)) else set(allowed)
+        return [tk for tk in actual if tk not in allowed_set]
 
     def authenticate(self, identity):
         """
@@ -712,6 +712,11 @@ def test_delete_authorization_failure(mock_auth_service, mock_zmq_credential):
     assert len(mock_auth._auth_pending) == 0
     assert len(mock_auth._auth_denied) == 0
 
+    # Deleting a pending credential must not approve it
+    mock_auth.read_auth_file()
+    assert len(mock_auth.auth_entries) == 0
+    assert len(mock_auth._auth_approved) == 0
+
 
 @pytest.mark.control
 def test_delete_denied_authorization(mock_auth_service, mock_zmq_credential):
@@ -730,3 +735,127 @@ def test_delete_denied_authorization(mock_auth_service, mock_zmq_credential):
     mock_auth.delete_authorization(auth['user_id'])
     mock_auth.read_auth_file()
     assert len(mock_auth._auth_denied) == 0
+
+
+@pytest.mark.control
+def test_denied_retries_survive_reload(mock_auth_service, mock_zmq_credential):
+    mock_auth = mock_auth_service
+    auth = mock_zmq_credential
+    mock_auth.authentication_server._update_auth_pending(
+        auth['domain'], auth['address'], auth['mechanism'], auth['credentials'], auth['user_id'])
+    mock_auth.deny_authorization(auth['user_id'])
+    mock_auth.read_auth_file()
+    denied = mock_auth._auth_denied[auth['user_id']]
+    assert denied['retries'] == 0
+
+    mock_auth.authentication_server._update_auth_pending(
+        auth['domain'], auth['address'], auth['mechanism'], auth['credentials'], auth['user_id'])
+    assert denied['retries'] == 1
+    assert len(mock_auth._auth_pending) == 0
+
+    # An unchanged denied entry is kept in place across a reload
+    mock_auth.read_auth_file()
+    assert mock_auth._auth_denied[auth['user_id']] is denied
+    assert mock_auth.get_denied_authorizations()[0]['retries'] == 1
+
+    mock_auth.auth_file.remove_by_index(0, is_allow=False)
+    mock_auth.read_auth_file()
+    assert auth['user_id'] not in mock_auth._auth_denied
+    assert len(mock_auth._auth_denied_by_key) == 0
+
+
+_CURVE_KEY = "A" * 43
+
+
+def test_authenticate_earlier_regex_entry_beats_exact_entry(mock_auth_service):
+    server = mock_auth_service.authentication_server
+    regex_entry = AuthEntry(mechanism="CURVE", credentials="/.*/", user_id="regex_user")
+    exact_entry = AuthEntry(mechanism="CURVE", credentials=_CURVE_KEY, user_id="exact_user")
+
+    server.update_auth_entries([regex_entry, exact_entry])
+    assert server.authenticate("vip", "127.0.0.1", "CURVE", [_CURVE_KEY]) == "regex_user"
+
+    server.update_auth_entries([exact_entry, regex_entry])
+    assert server.authenticate("vip", "127.0.0.1", "CURVE", [_CURVE_KEY]) == "exact_user"
+
+
+def test_authenticate_earlier_null_entry_beats_later_entries(mock_auth_service):
+    server = mock_auth_service.authentication_server
+    null_entry = AuthEntry(address="127.0.0.1", mechanism="NULL", user_id="null_user")
+    other_null_entry = AuthEntry(mechanism="NULL", user_id="other_null_user")
+
+    server.update_auth_entries([null_entry, other_null_entry])
+    assert server.authenticate("vip", "127.0.0.1", "NULL", []) == "null_user"
+    assert server.authenticate("vip", "10.0.0.1", "NULL", []) == "other_null_user"
+
+
+def test_authenticate_exact_entry_checks_domain_and_address(mock_auth_service):
+    server = mock_auth_service.authentication_server
+    exact_entry = AuthEntry(domain="vip", address="127.0.0.1", mechanism="CURVE",
+                            credentials=_CURVE_KEY, user_id="exact_user")
+    other_exact_entry = AuthEntry(domain="vip", address="10.0.0.1", mechanism="CURVE",
+                                  credentials=_CURVE_KEY, user_id="other_exact_user")
+    regex_entry = AuthEntry(mechanism="CURVE", credentials="/.*/", user_id="regex_user")
+
+    server.update_auth_entries([exact_entry, other_exact_entry])
+    assert server.authenticate("vip", "127.0.0.1", "CURVE", [_CURVE_KEY]) == "exact_user"
+    assert server.authenticate("vip", "10.0.0.1", "CURVE", [_CURVE_KEY]) == "other_exact_user"
+    assert server.authenticate("other", "127.0.0.1", "CURVE", [_CURVE_KEY]) is None
+    assert server.authenticate("vip", "10.0.0.2", "CURVE", [_CURVE_KEY]) is None
+
+    server.update_auth_entries([exact_entry, regex_entry])
+    assert server.authenticate("other", "127.0.0.1", "CURVE", [_CURVE_KEY]) == "regex_user"
+    assert server.authenticate("vip", "10.0.0.2", "CURVE", [_CURVE_KEY]) == "regex_user"
+
+
+def test_authenticate_cached_miss_cleared_on_reload(mock_auth_service):
+    mock_auth = mock_auth_service
+    server = mock_auth.authentication_server
+    assert server.authenticate("vip", "127.0.0.1", "CURVE", [_CURVE_KEY]) is None
+
+    mock_auth.auth_file.add(AuthEntry(mechanism="CURVE", credentials=_CURVE_KEY, user_id="new_user"))
+    # The miss stays cached until the auth file is reloaded
+    assert server.authenticate("vip", "127.0.0.1", "CURVE", [_CURVE_KEY]) is None
+
+    mock_auth.read_auth_file()
+    assert server.authenticate("vip", "127.0.0.1", "CURVE", [_CURVE_KEY]) == "new_user"
+
+
+def test_get_all_authorizations_cache_cleared_on_reload(mock_auth_service):
+    mock_auth = mock_auth_service
+    assert mock_auth.get_all_authorizations("new_user") == [[], [], []]
+
+    mock_auth.auth_file.add(AuthEntry(mechanism="CURVE", credentials=_CURVE_KEY, user_id="new_user",
+                                      capabilities=["new_cap"], groups=["new_group"], roles=["new_role"]))
+    # Unknown users stay cached until the auth file is reloaded
+    assert mock_auth.get_capabilities("new_user") == []
+
+    mock_auth.read_auth_file()
+    capabilities, groups, roles = mock_auth.get_all_authorizations("new_user")
+    assert list(capabilities) == ["new_cap"]
+    assert groups == ["new_group"]
+    assert roles == ["new_role"]
+
+
+def test_reload_with_list_fields_in_deny_entry(mock_auth_service, mock_zmq_credential):
+    mock_auth = mock_auth_service
+    auth = mock_zmq_credential
+    mock_auth.auth_file.add(AuthEntry(domain=auth['domain'], address=["10.0.0.1", "10.0.0.2"],
+                                      mechanism="PLAIN", credentials=["user1", "user2"],
+                                      user_id="denied_user"), is_allow=False)
+    mock_auth.read_auth_file()
+    assert len(mock_auth._auth_denied) == 1
+
+    # A list field never equals the strings of a ZAP request
+    mock_auth.authentication_server._update_auth_pending(
+        auth['domain'], "10.0.0.1", "PLAIN", "user1", auth['user_id'])
+    assert len(mock_auth._auth_pending) == 1
+    assert mock_auth._auth_denied["denied_user"]["retries"] == 0
+
+
+def test_delete_unknown_authorization(mock_auth_service):
+    mock_auth = mock_auth_service
+    mock_auth.delete_authorization("unknown_user")
+    assert len(mock_auth._auth_pending) == 0
+    assert len(mock_auth._auth_approved) == 0
+    assert len(mock_auth._auth_denied) == 0